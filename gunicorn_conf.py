@@ -0,0 +1,14 @@
+# Self-hosted deployment only; Vercel imports `app` from api/index.py directly.
+#   gunicorn -c gunicorn_conf.py index:app
+
+bind = "0.0.0.0:8000"
+
+# import index.py (and seed `system`) once in the master before forking
+preload_app = True
+
+# trips and bookings live in process memory, so separate worker processes
+# would each see their own copy; scale with threads instead (seat updates
+# are guarded by per-trip locks)
+workers = 1
+worker_class = "gthread"
+threads = 8
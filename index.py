@@ -1,13 +1,60 @@
-from flask import Flask, render_template, request
+import sys
+import threading
+from collections import OrderedDict
+from bisect import bisect_left
+import orjson
+from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple, ValuesView
+
+
+class OrjsonProvider(JSONProvider):
+    # orjson serialises dataclasses and enums natively, no asdict() needed.
+    # Enums are written by value, so API responses carry Booking.status as
+    # its integer form (0 = CANCELLED, 1 = CONFIRMED).
+
+    # Only default, sort_keys and indent map onto orjson; other json module
+    # arguments (separators, ensure_ascii, object_hook, ...) are ignored by
+    # both dumps and loads. orjson output is always compact UTF-8.
+
+    # types orjson cannot encode fall back to Flask's default handling
+    default = staticmethod(DefaultJSONProvider.default)
+
+    def dumps(self, obj, **kwargs):
+        option = 0
+        if kwargs.get("sort_keys"):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)  # templates/ and static/ are in the same folder (api/)
+app.json = OrjsonProvider(app)
+app.config["TEMPLATES_AUTO_RELOAD"] = False
+app.jinja_env.auto_reload = False
+
+# compiled once at import instead of looked up on every render_template()
+_TPL_INDEX = app.jinja_env.get_template("index.html")
+_TPL_TRIPS = app.jinja_env.get_template("trips.html")
+_TPL_BOOK = app.jinja_env.get_template("book.html")
+_TPL_BOOKINGS = app.jinja_env.get_template("bookings.html")
+_TPL_CANCEL = app.jinja_env.get_template("cancel.html")
 
 
 # ---------------- DATA MODELS ---------------- #
 
-@dataclass
+class Status(IntEnum):
+    CANCELLED = 0
+    CONFIRMED = 1
+
+
+@dataclass(eq=False, slots=True)
 class Trip:
     trip_id: int
     source: str
@@ -19,7 +66,7 @@ class Trip:
     price_per_seat: float
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Booking:
     booking_id: int
     passenger_name: str
@@ -27,7 +74,7 @@ class Booking:
     trip_id: int
     num_seats: int
     total_fare: float
-    status: str
+    status: Status
 
 
 # ---------------- CORE SYSTEM ---------------- #
@@ -36,99 +83,262 @@ class ReservationSystem:
     def __init__(self):
         self.trips: Dict[int, Trip] = {}
         self.bookings: Dict[int, Booking] = {}
+        # (source, destination, date) -> trip ids, source/destination lowercased
+        self._by_route: Dict[Tuple[str, str, str], List[int]] = {}
+        # (date, time, trip id) kept sorted for date lookups
+        self._by_date: List[Tuple[str, str, int]] = []
+        # trip id -> display text, shared by every booking row on that trip
+        self._trip_info: Dict[int, str] = {}
+        # seat checks and updates are serialised per trip; _lock only guards
+        # booking id allocation and the version counters
+        self._trip_locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
         self.next_trip_id = 1
         self.next_booking_id = 1
+        # bumped on every write so rendered pages can be reused until data changes
+        self._trips_version = 0
+        self._bookings_version = 0
         self._load_sample_data()
 
-    def _add_trip(self, source, destination, date, time, seats, price):
-        trip = Trip(
-            trip_id=self.next_trip_id,
-            source=source,
-            destination=destination,
-            date=date,
-            time=time,
-            total_seats=seats,
-            seats_available=seats,
-            price_per_seat=price,
-        )
-        self.trips[trip.trip_id] = trip
-        self.next_trip_id += 1
+    def _add_trips(self, rows):
+        # one index sort and one version bump for the whole batch
+        for source, destination, date, time, seats, price in rows:
+            # many trips share the same cities/dates; keep one copy of each string
+            source, destination = sys.intern(source), sys.intern(destination)
+            date, time = sys.intern(date), sys.intern(time)
+            trip = Trip(
+                trip_id=self.next_trip_id,
+                source=source,
+                destination=destination,
+                date=date,
+                time=time,
+                total_seats=seats,
+                seats_available=seats,
+                price_per_seat=price,
+            )
+            self.trips[trip.trip_id] = trip
+            self._trip_info[trip.trip_id] = f"{source} -> {destination} on {date} at {time}"
+            self._trip_locks[trip.trip_id] = threading.Lock()
+            key = tuple(map(sys.intern, self.route_key(source, destination, date)))
+            self._by_route.setdefault(key, []).append(trip.trip_id)
+            self._by_date.append((trip.date, trip.time, trip.trip_id))
+            self.next_trip_id += 1
+        self._by_date.sort()
+        self._trips_version += 1
+
+    @staticmethod
+    def route_key(source, destination, date) -> Tuple[str, str, str]:
+        return source.lower(), destination.lower(), date
+
+    @property
+    def trips_version(self) -> int:
+        return self._trips_version
+
+    @property
+    def bookings_version(self) -> int:
+        return self._bookings_version
 
     def _load_sample_data(self):
-        self._add_trip("Bhopal", "Indore", "2025-12-10", "09:00", 40, 450)
-        self._add_trip("Bhopal", "Indore", "2025-12-10", "18:00", 40, 500)
-        self._add_trip("Bhopal", "Delhi", "2025-12-11", "20:00", 50, 1200)
-        self._add_trip("Indore", "Bhopal", "2025-12-11", "07:30", 40, 450)
-        self._add_trip("Bhopal", "Mumbai", "2025-12-12", "21:00", 50, 1800)
+        self._add_trips([
+            ("Bhopal", "Indore", "2025-12-10", "09:00", 40, 450),
+            ("Bhopal", "Indore", "2025-12-10", "18:00", 40, 500),
+            ("Bhopal", "Delhi", "2025-12-11", "20:00", 50, 1200),
+            ("Indore", "Bhopal", "2025-12-11", "07:30", 40, 450),
+            ("Bhopal", "Mumbai", "2025-12-12", "21:00", 50, 1800),
+        ])
+
+    def list_all_trips(self) -> ValuesView[Trip]:
+        # trips are only added at startup, so a live view is safe to iterate
+        return self.trips.values()
+
+    def search_trips(self, source, destination, date) -> List[Trip]:
+        trip_ids = self._by_route.get(self.route_key(source, destination, date), ())
+        return [self.trips[i] for i in trip_ids]
 
-    def list_all_trips(self) -> List[Trip]:
-        return list(self.trips.values())
+    def trips_on_date(self, date) -> List[Trip]:
+        # matches a date prefix too, e.g. "2025-12" returns every December trip
+        lo = bisect_left(self._by_date, (date,))
+        hi = bisect_left(self._by_date, (date + "\uffff",))
+        return [self.trips[trip_id] for _, _, trip_id in self._by_date[lo:hi]]
 
     def book_ticket(self, name, age, trip_id, seats) -> Optional[Booking]:
+        booked = self.book_tickets_bulk(trip_id, [{"name": name, "age": age, "seats": seats}])
+        return booked[0] if booked else None
+
+    def book_tickets_bulk(self, trip_id, passengers) -> Optional[List[Booking]]:
         trip = self.trips.get(int(trip_id))
-        if trip is None:
+        if trip is None or not passengers:
             return None
-        seats = int(seats)
-        if seats <= 0 or trip.seats_available < seats:
+        rows = [(p["name"], int(p["age"]), int(p["seats"])) for p in passengers]
+        if any(seats <= 0 for _, _, seats in rows):
             return None
+        total_seats = sum(seats for _, _, seats in rows)
 
-        fare = seats * trip.price_per_seat
-        booking = Booking(
-            booking_id=self.next_booking_id,
-            passenger_name=name,
-            passenger_age=int(age),
-            trip_id=trip.trip_id,
-            num_seats=seats,
-            total_fare=fare,
-            status="CONFIRMED",
-        )
-        self.bookings[booking.booking_id] = booking
-        self.next_booking_id += 1
-        trip.seats_available -= seats
-        return booking
+        with self._trip_locks[trip.trip_id]:
+            if trip.seats_available < total_seats:
+                return None
+            trip.seats_available -= total_seats
+            with self._lock:
+                base_id = self.next_booking_id
+                self.next_booking_id += len(rows)
+                booked = [
+                    Booking(
+                        booking_id=base_id + i,
+                        passenger_name=name,
+                        passenger_age=age,
+                        trip_id=trip.trip_id,
+                        num_seats=seats,
+                        total_fare=seats * trip.price_per_seat,
+                        status=Status.CONFIRMED,
+                    )
+                    for i, (name, age, seats) in enumerate(rows)
+                ]
+                self.bookings.update((b.booking_id, b) for b in booked)
+                self._trips_version += 1
+                self._bookings_version += 1
+        return booked
+
+    def trip_info_map(self) -> Dict[int, str]:
+        return self._trip_info
 
     def list_all_bookings(self) -> List[Booking]:
+        # copied: another thread may add a booking while a page is rendering
         return list(self.bookings.values())
 
     def cancel_booking(self, booking_id) -> bool:
         booking = self.bookings.get(int(booking_id))
-        if not booking or booking.status == "CANCELLED":
+        if not booking:
             return False
-        trip = self.trips.get(booking.trip_id)
-        if trip:
-            trip.seats_available += booking.num_seats
-        booking.status = "CANCELLED"
+        with self._trip_locks[booking.trip_id]:
+            if booking.status == Status.CANCELLED:
+                return False
+            self.trips[booking.trip_id].seats_available += booking.num_seats
+            booking.status = Status.CANCELLED
+            with self._lock:
+                self._trips_version += 1
+                self._bookings_version += 1
         return True
 
 
 system = ReservationSystem()
 
 
+# ---------------- RESPONSE CACHE ---------------- #
+
+_pages = {}
+
+def cached_render(key, version, render_fn):
+    cached = _pages.get(key)
+    if cached and cached[0] == version:
+        return cached[1]
+    html = render_fn()
+    _pages[key] = (version, html)
+    return html
+
+
+# search/date pages are keyed by user input, so they get their own capped LRU;
+# requesting many distinct searches cannot push out the fixed pages above
+_SEARCH_CACHE_SIZE = 256
+_search_cache = OrderedDict()
+_search_cache_lock = threading.Lock()
+
+def cached_search_render(key, version, render_fn):
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached and cached[0] == version:
+            _search_cache.move_to_end(key)
+            return cached[1]
+    html = render_fn()
+    with _search_cache_lock:
+        _search_cache[key] = (version, html)
+        _search_cache.move_to_end(key)
+        if len(_search_cache) > _SEARCH_CACHE_SIZE:
+            _search_cache.popitem(last=False)
+    return html
+
+
 # ---------------- ROUTES ---------------- #
 
 @app.route("/")
 def home():
-    return render_template("index.html")
+    return _TPL_INDEX.render()
 
 @app.route("/trips")
 def trips():
-    return render_template("trips.html", trips=system.list_all_trips())
+    source = request.args.get("source")
+    destination = request.args.get("destination")
+    date = request.args.get("date")
+    if source and destination and date:
+        return cached_search_render(
+            ("search",) + system.route_key(source, destination, date), system.trips_version,
+            lambda: _TPL_TRIPS.render(trips=system.search_trips(source, destination, date)),
+        )
+    if date:
+        return cached_search_render(
+            ("date", date), system.trips_version,
+            lambda: _TPL_TRIPS.render(trips=system.trips_on_date(date)),
+        )
+    return cached_render(
+        "trips", system.trips_version,
+        lambda: _TPL_TRIPS.render(trips=system.list_all_trips()),
+    )
+
+@app.route("/api/trips")
+def api_trips():
+    return jsonify(list(system.list_all_trips()))
 
 @app.route("/book", methods=["GET", "POST"])
 def book():
-    booking = None
     if request.method == "POST":
-        name = request.form["name"]
-        age = request.form["age"]
-        trip_id = request.form["trip_id"]
-        seats = request.form["seats"]
-        booking = system.book_ticket(name, age, trip_id, seats)
+        form = request.form
+        booking = system.book_ticket(form["name"], form["age"], form["trip_id"], form["seats"])
+        return _TPL_BOOK.render(booking=booking, trips=system.list_all_trips())
+
+    return cached_render(
+        "book", system.trips_version,
+        lambda: _TPL_BOOK.render(booking=None, trips=system.list_all_trips()),
+    )
+
+def _json_int(value):
+    # JSON floats such as 1.5 would otherwise be truncated by int()
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(value)
+    return value
+
+@app.route("/book_bulk", methods=["POST"])
+def book_bulk():
+    data = request.get_json(silent=True)
+    try:
+        if not isinstance(data, dict) or not isinstance(data["passengers"], list):
+            raise TypeError(data)
+        trip_id = _json_int(data["trip_id"])
+        passengers = []
+        for p in data["passengers"]:
+            if not isinstance(p["name"], str):
+                raise TypeError(p)
+            passengers.append(
+                {"name": p["name"], "age": _json_int(p["age"]), "seats": _json_int(p["seats"])}
+            )
+    except (KeyError, TypeError, ValueError):
+        return jsonify(error="Malformed request: expected trip_id and a list of passengers."), 400
+    if not passengers:
+        return jsonify(error="No passengers given."), 400
+    if any(p["seats"] <= 0 for p in passengers):
+        return jsonify(error="Seats must be a positive number."), 400
 
-    return render_template("book.html", booking=booking, trips=system.list_all_trips())
+    booked = system.book_tickets_bulk(trip_id, passengers)
+    if booked is None:
+        return jsonify(error="Invalid trip ID or not enough seats."), 400
+    return jsonify(booked)
 
 @app.route("/bookings")
 def bookings():
-    return render_template("bookings.html", bookings=system.list_all_bookings())
+    return cached_render(
+        "bookings", system.bookings_version,
+        lambda: _TPL_BOOKINGS.render(
+            bookings=system.list_all_bookings(), trip_info_map=system.trip_info_map()
+        ),
+    )
 
 @app.route("/cancel", methods=["GET", "POST"])
 def cancel():
@@ -136,7 +346,7 @@ def cancel():
     if request.method == "POST":
         booking_id = request.form["booking_id"]
         status = system.cancel_booking(booking_id)
-    return render_template("cancel.html", status=status)
+    return _TPL_CANCEL.render(status=status)
 
 
 # No handler() function needed – Vercel uses the `app` variable automatically.